@@ -0,0 +1,59 @@
+"""
+Shared pytest configuration for the Wafid Automation Tool test suite
+"""
+
+import ast
+import functools
+import inspect
+from pathlib import Path
+
+import pytest
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_module(path):
+    """Parse a source file once and cache its AST"""
+    return ast.parse(Path(path).read_text(encoding='utf-8'), filename=path)
+
+
+def _ast_of(func):
+    """Return the FunctionDef node for a function or method"""
+    # Key the cache on the plain function so bound methods (and their
+    # instances) are neither cache misses nor kept alive by the cache
+    return _function_node(inspect.unwrap(getattr(func, '__func__', func)))
+
+
+@functools.lru_cache(maxsize=None)
+def _function_node(func):
+    """Look up a plain function's FunctionDef node in its cached module AST"""
+    node = _parse_module(inspect.getsourcefile(func))
+    for name in func.__qualname__.split('.'):
+        node = next(
+            child for child in node.body
+            if isinstance(child, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+            and child.name == name
+        )
+    return node
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _dirs():
+    """Ensure the data and logs directories exist before any test runs"""
+    Path("data").mkdir(exist_ok=True)
+    Path("logs").mkdir(exist_ok=True)
+
+
+@pytest.fixture(scope="session")
+def browser_automation():
+    """Single BrowserAutomation instance shared by every test in the session"""
+    from components.browser_automation import BrowserAutomation
+
+    browser = BrowserAutomation(headless=True)
+    yield browser
+    browser.close_session()
+
+
+@pytest.fixture(scope="session")
+def ast_of():
+    """AST lookup for source-structure checks; each module is parsed once per session"""
+    return _ast_of
@@ -2,13 +2,18 @@ import time
 import random
 import json
 import os
-from typing import Dict, List, Optional, Any, Callable
+import re
+from typing import Dict, List, Optional, Any, Callable, IO, Union
 from .logger import logger
 from .proxy_manager import ProxyManager
 from .browser_automation import BrowserAutomation
 from .form_handler import FormHandler
 
 
+# http(s) URL with a host and no whitespace, compiled once at import
+_URL_RE = re.compile(r'^https?://[^\s/$.?#][^\s]*$')
+
+
 class AutomationEngine:
     """Main automation engine with matching logic and retry mechanism"""
     
@@ -64,6 +69,16 @@ class AutomationEngine:
             logger.error(f"Failed to load config: {e}, using defaults")
             return {}
     
+    @staticmethod
+    def _is_valid_booking_url(url: str) -> bool:
+        """Check for a non-empty http(s) URL with a domain and no spaces"""
+        return bool(url) and _URL_RE.match(url.strip()) is not None
+    
+    @staticmethod
+    def validate_urls(urls: List[str]) -> List[bool]:
+        """Validate a batch of booking URLs in one pass, one result per URL"""
+        return [AutomationEngine._is_valid_booking_url(url) for url in urls]
+    
     def set_booking_url(self, url: str):
         """Set the booking URL with validation"""
         if not url:
@@ -73,31 +88,9 @@ class AutomationEngine:
         # Strip whitespace
         url = url.strip()
         
-        # Basic URL validation
-        if not url.startswith(('http://', 'https://')):
-            logger.error("Booking URL must start with http:// or https://")
-            return False
-        
-        # Check for common URL issues
-        if ' ' in url:
-            logger.error("Booking URL cannot contain spaces")
-            return False
-        
-        # Validate URL structure
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            
-            if not parsed.netloc:
-                logger.error("Invalid URL: missing domain")
-                return False
-            
-            if not parsed.scheme in ['http', 'https']:
-                logger.error("Invalid URL: scheme must be http or https")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Invalid URL format: {e}")
+        # Validate scheme, domain and absence of spaces in one pass
+        if not self._is_valid_booking_url(url):
+            logger.error(f"Invalid booking URL: '{url}' (must be http:// or https:// with a domain and no spaces)")
             return False
         
         self.booking_url = url
@@ -114,8 +107,8 @@ class AutomationEngine:
         self.success_callback = success_callback
         self.status_callback = status_callback
     
-    def load_candidate_data(self, csv_file: str) -> bool:
-        """Load candidate data from CSV"""
+    def load_candidate_data(self, csv_file: Union[str, IO[str]]) -> bool:
+        """Load candidate data from a CSV file path or an open text stream"""
         return self.form_handler.load_candidate_data(csv_file)
     
     def start_automation(self) -> bool:
@@ -157,6 +150,9 @@ class AutomationEngine:
         finally:
             self.is_running = False
             self.stats['total_time'] = time.time() - self.stats['total_time']
+            
+            # Always release the browser and its temp profile directory
+            self.browser.close_session()
     
     def stop_automation(self):
         """Stop the automation process"""
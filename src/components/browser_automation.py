@@ -7,6 +7,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import json
+import re
 import time
 import random
 from typing import Dict, List, Optional, Any, Tuple
@@ -15,6 +16,46 @@ from .logger import logger
 from .network_monitor import NetworkMonitor
 
 
+# Field purposes and their attribute patterns, in priority order. Specific
+# passport date/place purposes precede the generic passport number, and
+# nationality precedes country. 'nation' must not match 'national', so it
+# shadows neither nationality nor national ID. Multi-word patterns only allow
+# space/underscore/hyphen separators so they cannot span unrelated words,
+# e.g. "Passport No. (as issued)".
+_FIELD_PATTERNS = [
+    ('nationality', ['nationality', r'citizen(?!ship)']),
+    ('country', ['country', r'nation(?!al)', 'citizenship']),
+    ('city', ['city', 'town', 'location']),
+    ('country_traveling_to', ['traveling', 'destination', 'travel_to']),
+    ('first_name', ['firstname', 'first_name', 'fname', 'given_name']),
+    ('last_name', ['lastname', 'last_name', 'lname', 'surname', 'family_name']),
+    ('date_of_birth', ['birth', 'dob', 'born', 'birthday']),
+    ('gender', ['gender', 'sex']),
+    ('marital_status', ['marital', 'marriage', 'married']),
+    ('passport_issue_place', [r'passport[ _-]*place', r'issue[ _-]*place']),
+    ('passport_issue_date', [r'passport[ _-]*issue', r'issue[ _-]*date']),
+    ('passport_expiry_date', [r'passport[ _-]*expir', r'expir\w*[ _-]*date']),
+    ('passport_number', ['passport', 'passport_num', 'passport_no']),
+    ('visa_type', ['visa', 'visa_type']),
+    ('email', ['email', 'mail']),
+    ('phone', ['phone', 'mobile', 'tel']),
+    ('national_id', [r'national[ _-]*id', r'id[ _-]*number', r'civil[ _-]*id']),
+    ('position', ['position', 'job', 'occupation', 'profession']),
+]
+
+
+def _build_matcher(patterns):
+    """Split patterns into plain substrings and one compiled search for the rest"""
+    literals = tuple(p for p in patterns if re.escape(p) == p)
+    regexes = [p for p in patterns if re.escape(p) != p]
+    return literals, re.compile('|'.join(regexes)).search if regexes else None
+
+
+# Substring checks are much cheaper than a regex search, so only the
+# multi-word and lookahead patterns go through the regex engine
+_FIELD_MATCHERS = [(purpose, *_build_matcher(patterns)) for purpose, patterns in _FIELD_PATTERNS]
+
+
 class BrowserAutomation:
     """Manages browser sessions with fresh startup and DOM detection"""
     
@@ -26,12 +67,13 @@ class BrowserAutomation:
         self.user_agent = UserAgent()
         self.temp_dir = None  # Track temp directory for cleanup
     
-    def __del__(self):
-        """Destructor to ensure cleanup"""
-        try:
-            self.close_session()
-        except Exception:
-            pass
+    def __enter__(self):
+        """Allow use as a context manager so cleanup is deterministic"""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the session and remove the temp directory on scope exit"""
+        self.close_session()
         
     def create_fresh_session(self, proxy: Optional[str] = None) -> bool:
         """Create a completely fresh browser session"""
@@ -292,40 +334,21 @@ class BrowserAutomation:
             logger.error(f"Form field detection failed: {e}")
             return {}
     
-    def _determine_field_purpose(self, element_id: str, name: str, placeholder: str, 
-                                label: str, input_type: str) -> str:
+    @staticmethod
+    def _determine_field_purpose(element_id: str, name: str, placeholder: str,
+                                 label: str, input_type: str) -> str:
         """Determine the purpose of a form field based on its attributes"""
         
         # Combine all text for analysis
         all_text = f"{element_id} {name} {placeholder} {label}".lower()
         
-        # Field mapping based on common patterns
-        field_mappings = {
-            'country': ['country', 'nation', 'citizenship'],
-            'city': ['city', 'town', 'location'],
-            'country_traveling_to': ['traveling', 'destination', 'travel_to'],
-            'first_name': ['firstname', 'first_name', 'fname', 'given_name'],
-            'last_name': ['lastname', 'last_name', 'lname', 'surname', 'family_name'],
-            'date_of_birth': ['birth', 'dob', 'born', 'birthday'],
-            'nationality': ['nationality', 'citizen'],
-            'gender': ['gender', 'sex'],
-            'marital_status': ['marital', 'marriage', 'married'],
-            'passport_number': ['passport', 'passport_num', 'passport_no'],
-            'passport_issue_date': ['passport.*issue', 'issue.*date'],
-            'passport_issue_place': ['passport.*place', 'issue.*place'],
-            'passport_expiry_date': ['passport.*expir', 'expir.*date'],
-            'visa_type': ['visa', 'visa_type'],
-            'email': ['email', 'mail'],
-            'phone': ['phone', 'mobile', 'tel'],
-            'national_id': ['national.*id', 'id.*number', 'civil.*id'],
-            'position': ['position', 'job', 'occupation', 'profession']
-        }
-        
-        # Check for matches
-        for field_purpose, patterns in field_mappings.items():
-            for pattern in patterns:
+        # First purpose in priority order with a matching pattern wins
+        for field_purpose, literals, search in _FIELD_MATCHERS:
+            for pattern in literals:
                 if pattern in all_text:
                     return field_purpose
+            if search and search(all_text):
+                return field_purpose
         
         # Special cases for input types
         if input_type == 'email':
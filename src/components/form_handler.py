@@ -1,6 +1,6 @@
 import pandas as pd
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, IO, Union
 from .logger import logger
 from .browser_automation import BrowserAutomation
 from .network_monitor import NetworkMonitor
@@ -14,13 +14,13 @@ class FormHandler:
         self.candidate_data = {}
         self.appointment_data = {}
         
-    def load_candidate_data(self, csv_file: str) -> bool:
-        """Load candidate data from CSV file"""
+    def load_candidate_data(self, csv_file: Union[str, IO[str]]) -> bool:
+        """Load candidate data from a CSV file path or an open text stream"""
         try:
             df = pd.read_csv(csv_file)
             
             if len(df) == 0:
-                logger.error("CSV file is empty")
+                logger.error("CSV data contains no candidate rows")
                 return False
             
             # Use first row as candidate data
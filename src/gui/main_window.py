@@ -40,6 +40,9 @@ class WafidAutomationGUI:
         
         # Center window on screen
         self.center_window()
+        
+        # Close the browser session when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
     def setup_styles(self):
         """Configure ttk styles"""
@@ -421,6 +424,11 @@ class WafidAutomationGUI:
         self.start_button.configure(state='normal')
         self.stop_button.configure(state='disabled')
     
+    def on_closing(self):
+        """Stop automation and clean up the browser before exiting"""
+        self.automation_engine.stop_automation()
+        self.root.destroy()
+    
     def on_automation_success(self):
         """Called when automation succeeds"""
         def success_update():
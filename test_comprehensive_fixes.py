@@ -4,332 +4,172 @@ Comprehensive test suite for all bug fixes
 Tests resource leaks, race conditions, thread safety, and error handling
 """
 
-import sys
+import ast
+import logging
+import logging.handlers
 import os
-from pathlib import Path
 import tempfile
-import threading
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Add src directory to Python path
-src_dir = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_dir))
+import pytest
 
-def test_browser_temp_directory_cleanup():
+# Components import Selenium; skip cleanly where it is not installed
+pytest.importorskip("selenium")
+
+from components.automation_engine import AutomationEngine
+from components.browser_automation import BrowserAutomation
+from components.logger import logger
+from components.network_monitor import NetworkMonitor
+from components.proxy_manager import ProxyManager
+
+def _count(node, node_type, predicate=lambda n: True):
+    """Count AST nodes of the given type that satisfy predicate"""
+    return sum(1 for n in ast.walk(node) if isinstance(n, node_type) and predicate(n))
+
+def _is_self_attr(node, attr):
+    """Check whether node is ``self.<attr>``"""
+    return (isinstance(node, ast.Attribute) and node.attr == attr
+            and isinstance(node.value, ast.Name) and node.value.id == 'self')
+
+def _uses_lock(node):
+    """Check whether a With node acquires ``self.lock``"""
+    return any(_is_self_attr(item.context_expr, 'lock') for item in node.items)
+
+def test_browser_temp_directory_cleanup(browser_automation, ast_of):
     """Test that temporary directories are properly cleaned up"""
-    print("Testing browser temporary directory cleanup...")
+    browser = browser_automation
+    
+    # Check that temp_dir is tracked
+    assert hasattr(browser, 'temp_dir'), "Browser should track temp_dir"
+    assert browser.temp_dir is None, "temp_dir should be None initially"
     
-    try:
-        from components.browser_automation import BrowserAutomation
-        
-        # Create browser instance
-        browser = BrowserAutomation(headless=True)
-        
-        # Check that temp_dir is tracked
-        assert hasattr(browser, 'temp_dir'), "Browser should track temp_dir"
-        assert browser.temp_dir is None, "temp_dir should be None initially"
-        
-        print("  ✓ Browser tracks temporary directory")
-        
-        # Note: We can't actually test browser creation without Chrome installed
-        # but we can verify the cleanup logic exists
-        
-        # Verify close_session includes cleanup
-        import inspect
-        source = inspect.getsource(browser.close_session)
-        assert 'shutil.rmtree' in source, "close_session should clean up temp directory"
-        assert 'self.temp_dir' in source, "close_session should reference temp_dir"
-        
-        print("  ✓ close_session includes temp directory cleanup")
-        
-        # Verify destructor exists
-        assert hasattr(browser, '__del__'), "Browser should have destructor"
-        
-        print("  ✓ Browser has destructor for cleanup")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Note: We can't actually test browser creation without Chrome installed
+    # but we can verify the cleanup logic exists
+    
+    # Verify close_session includes cleanup
+    node = ast_of(BrowserAutomation.close_session)
+    assert _count(node, ast.Call, lambda n: isinstance(n.func, ast.Attribute) and n.func.attr == 'rmtree'
+                  and isinstance(n.func.value, ast.Name) and n.func.value.id == 'shutil'), \
+        "close_session should clean up temp directory"
+    assert _count(node, ast.Attribute, lambda n: _is_self_attr(n, 'temp_dir')), \
+        "close_session should reference temp_dir"
+    
+    # Verify cleanup is exposed as a context manager
+    assert hasattr(browser, '__enter__') and hasattr(browser, '__exit__'), \
+        "Browser should support the context manager protocol"
+    
+    with BrowserAutomation(headless=True) as scoped_browser:
+        assert scoped_browser.temp_dir is None, "temp_dir should be None initially"
+        scoped_browser.temp_dir = tempfile.mkdtemp()
+        temp_dir = scoped_browser.temp_dir
+    
+    assert not os.path.exists(temp_dir), "Leaving the with block should remove temp_dir"
 
-def test_proxy_manager_race_condition():
+def test_proxy_manager_race_condition(ast_of):
     """Test that proxy manager handles concurrent access correctly"""
-    print("\nTesting proxy manager race condition fix...")
+    pm = ProxyManager()
+    
+    # Verify lock exists
+    assert hasattr(pm, 'lock'), "ProxyManager should have lock"
+    
+    # Verify refresh_proxy_list uses lock correctly
+    node = ast_of(pm.refresh_proxy_list)
+    lock_blocks = _count(node, ast.With, _uses_lock)
     
-    try:
-        from components.proxy_manager import ProxyManager
-        
-        pm = ProxyManager()
-        
-        # Verify lock exists
-        assert hasattr(pm, 'lock'), "ProxyManager should have lock"
-        
-        print("  ✓ ProxyManager has threading lock")
-        
-        # Verify refresh_proxy_list uses lock correctly
-        import inspect
-        source = inspect.getsource(pm.refresh_proxy_list)
-        
-        # Check that lock is used but not held during long operations
-        assert 'with self.lock:' in source, "refresh_proxy_list should use lock"
-        assert source.count('with self.lock:') >= 2, "Lock should be used multiple times (not held continuously)"
-        
-        print("  ✓ refresh_proxy_list uses lock correctly (not held during long operations)")
-        
-        # Test concurrent access
-        results = []
-        errors = []
-        
-        def get_proxy():
-            try:
-                proxy = pm.get_next_proxy()
-                results.append(proxy)
-            except Exception as e:
-                errors.append(e)
-        
-        threads = [threading.Thread(target=get_proxy) for _ in range(10)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
-        
-        assert len(errors) == 0, f"No errors should occur during concurrent access: {errors}"
-        
-        print(f"  ✓ Concurrent access test passed ({len(threads)} threads)")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Check that lock is used but not held during long operations
+    assert lock_blocks >= 1, "refresh_proxy_list should use lock"
+    assert lock_blocks >= 2, "Lock should be used multiple times (not held continuously)"
+    
+    # Test concurrent access
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(pm.get_next_proxy) for _ in range(10)]
+        for future in as_completed(futures):
+            future.result()
 
-def test_logger_thread_safety():
+def test_logger_thread_safety(ast_of, monkeypatch):
     """Test that logger handles concurrent logging correctly"""
-    print("\nTesting logger thread safety fix...")
+    # Verify lock exists
+    assert hasattr(logger, 'lock'), "Logger should have lock"
+    
+    # Verify GUI callback is called outside lock
+    
+    # Check info method
+    info_node = ast_of(logger.info)
+    assert _count(info_node, ast.With, _uses_lock), "info should use lock"
+    assert _count(info_node, ast.Call, lambda n: _is_self_attr(n.func, '_log_to_gui')), \
+        "info should call _log_to_gui"
     
-    try:
-        from components.logger import logger
-        
-        # Verify lock exists
-        assert hasattr(logger, 'lock'), "Logger should have lock"
-        
-        print("  ✓ Logger has threading lock")
-        
-        # Verify GUI callback is called outside lock
-        import inspect
-        
-        # Check info method
-        info_source = inspect.getsource(logger.info)
-        assert 'with self.lock:' in info_source, "info should use lock"
-        assert '_log_to_gui' in info_source, "info should call _log_to_gui"
-        
-        # Verify _log_to_gui doesn't hold lock
-        gui_source = inspect.getsource(logger._log_to_gui)
-        assert 'with self.lock:' not in gui_source, "_log_to_gui should not hold lock"
-        
-        print("  ✓ GUI callback called outside lock (prevents deadlocks)")
-        
-        # Test concurrent logging
-        errors = []
-        
-        def log_messages():
-            try:
-                for i in range(10):
-                    logger.info(f"Test message {i}")
-                    logger.warning(f"Test warning {i}")
-                    logger.error(f"Test error {i}")
-            except Exception as e:
-                errors.append(e)
-        
-        threads = [threading.Thread(target=log_messages) for _ in range(5)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
-        
-        assert len(errors) == 0, f"No errors should occur during concurrent logging: {errors}"
-        
-        print(f"  ✓ Concurrent logging test passed ({len(threads)} threads, 30 messages each)")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Verify _log_to_gui doesn't hold lock
+    gui_node = ast_of(logger._log_to_gui)
+    assert not _count(gui_node, ast.With, _uses_lock), "_log_to_gui should not hold lock"
+    
+    # Test concurrent logging into memory to keep disk and console I/O out of the test
+    def log_messages(_):
+        for i in range(10):
+            logger.info(f"Test message {i}")
+            logger.warning(f"Test warning {i}")
+            logger.error(f"Test error {i}")
+    
+    monkeypatch.setattr(logger.logger, 'handlers', [
+        logging.handlers.MemoryHandler(capacity=10000, target=logging.NullHandler())
+    ])
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(log_messages, n) for n in range(5)]
+        for future in as_completed(futures):
+            future.result()
 
-def test_network_monitor_error_handling():
+def test_network_monitor_error_handling(ast_of):
     """Test that network monitor handles errors gracefully"""
-    print("\nTesting network monitor error handling...")
+    # Verify error handling in wait_for_response
+    node = ast_of(NetworkMonitor.wait_for_response)
     
-    try:
-        from components.network_monitor import NetworkMonitor
-        
-        # Verify error handling in wait_for_response
-        import inspect
-        source = inspect.getsource(NetworkMonitor.wait_for_response)
-        
-        # Check for proper error handling
-        assert 'try:' in source, "wait_for_response should have try blocks"
-        assert 'except Exception' in source, "wait_for_response should catch exceptions"
-        assert source.count('except') >= 3, "Multiple exception handlers for robustness"
-        
-        print("  ✓ wait_for_response has comprehensive error handling")
-        
-        # Check for safe dictionary access
-        assert '.get(' in source, "Should use safe dictionary access (.get())"
-        
-        print("  ✓ Uses safe dictionary access methods")
-        
-        # Verify _enable_network_logging checks driver
-        enable_source = inspect.getsource(NetworkMonitor._enable_network_logging)
-        assert 'if not self.driver' in enable_source, "Should check if driver exists"
-        
-        print("  ✓ _enable_network_logging checks driver before use")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-def test_automation_engine_cleanup():
-    """Test that automation engine properly cleans up resources"""
-    print("\nTesting automation engine cleanup...")
+    # Check for proper error handling
+    assert _count(node, ast.Try), "wait_for_response should have try blocks"
+    assert _count(node, ast.ExceptHandler,
+                  lambda n: isinstance(n.type, ast.Name) and n.type.id == 'Exception'), \
+        "wait_for_response should catch exceptions"
+    assert _count(node, ast.ExceptHandler) >= 3, "Multiple exception handlers for robustness"
     
-    try:
-        from components.automation_engine import AutomationEngine
-        
-        engine = AutomationEngine()
-        
-        # Verify stop_automation includes cleanup
-        import inspect
-        source = inspect.getsource(engine.stop_automation)
-        
-        assert 'close_session' in source, "stop_automation should close browser session"
-        assert 'try:' in source, "Should handle cleanup errors gracefully"
-        
-        print("  ✓ stop_automation includes browser cleanup")
-        
-        # Test that engine can be stopped safely
-        engine.is_running = True
-        engine.stop_automation()
-        
-        assert engine.is_running == False, "Engine should be stopped"
-        
-        print("  ✓ Engine stops safely")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-def test_passport_expiry_field_mapping():
-    """Test that passport expiry field is correctly mapped"""
-    print("\nTesting passport expiry field mapping fix...")
+    # Check for safe dictionary access
+    assert _count(node, ast.Call, lambda n: isinstance(n.func, ast.Attribute) and n.func.attr == 'get'), \
+        "Should use safe dictionary access (.get())"
     
-    try:
-        from components.browser_automation import BrowserAutomation
-        from components.form_handler import FormHandler
-        
-        browser = BrowserAutomation()
-        
-        # Test field detection
-        result = browser._determine_field_purpose(
-            'passport_expiry_date',
-            'passport_expiry_date',
-            'Passport Expiry Date',
-            'Passport Expiry Date',
-            'date'
-        )
-        
-        assert result == 'passport_expiry_date', f"Should detect as 'passport_expiry_date', got '{result}'"
-        
-        print("  ✓ Field detection returns 'passport_expiry_date'")
-        
-        # Verify form handler uses correct key
-        import inspect
-        source = inspect.getsource(FormHandler.fill_candidate_info)
-        
-        assert "'passport_expiry_date':" in source, "Form handler should use 'passport_expiry_date' key"
-        assert "'passport_expiry':" not in source, "Form handler should not use old 'passport_expiry' key"
-        
-        print("  ✓ Form handler uses correct field key")
-        
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Verify _enable_network_logging checks driver
+    enable_node = ast_of(NetworkMonitor._enable_network_logging)
+    assert _count(enable_node, ast.If,
+                  lambda n: isinstance(n.test, ast.UnaryOp) and isinstance(n.test.op, ast.Not)
+                  and _is_self_attr(n.test.operand, 'driver')), \
+        "Should check if driver exists"
 
-def main():
-    """Run all comprehensive tests"""
-    print("=== Comprehensive Bug Fixes Test Suite ===\n")
+def test_automation_engine_cleanup(ast_of):
+    """Test that automation engine properly cleans up resources"""
+    engine = AutomationEngine()
     
-    # Ensure directories exist
-    os.makedirs("data", exist_ok=True)
-    os.makedirs("logs", exist_ok=True)
+    # Verify stop_automation includes cleanup
+    node = ast_of(AutomationEngine.stop_automation)
     
-    tests = [
-        ("Resource Leak Fix", test_browser_temp_directory_cleanup),
-        ("Race Condition Fix", test_proxy_manager_race_condition),
-        ("Thread Safety Fix", test_logger_thread_safety),
-        ("Error Handling Fix", test_network_monitor_error_handling),
-        ("Cleanup Fix", test_automation_engine_cleanup),
-        ("Field Mapping Fix", test_passport_expiry_field_mapping),
-    ]
+    assert _count(node, ast.Call, lambda n: isinstance(n.func, ast.Attribute) and n.func.attr == 'close_session'), \
+        "stop_automation should close browser session"
+    assert _count(node, ast.Try), "Should handle cleanup errors gracefully"
     
-    passed = 0
-    total = len(tests)
+    # Test that engine can be stopped safely
+    engine.is_running = True
+    engine.stop_automation()
     
-    for test_name, test_func in tests:
-        print(f"\n{'='*60}")
-        print(f"Test: {test_name}")
-        print('='*60)
-        try:
-            if test_func():
-                passed += 1
-                print(f"\n✅ {test_name} PASSED")
-            else:
-                print(f"\n❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"\n❌ {test_name} CRASHED: {e}")
-            import traceback
-            traceback.print_exc()
+    assert engine.is_running == False, "Engine should be stopped"
+
+def test_automation_engine_closes_browser_after_run(monkeypatch):
+    """Test that start_automation releases the browser temp dir even when it fails"""
+    engine = AutomationEngine()
+    engine.set_target_medical_center("Test Center")
+    engine.form_handler.candidate_data = {'first_name': 'John'}
+    engine.browser.temp_dir = tempfile.mkdtemp()
+    temp_dir = engine.browser.temp_dir
     
-    print(f"\n{'='*60}")
-    print("=== Test Results ===")
-    print(f"Passed: {passed}/{total}")
-    print(f"Failed: {total - passed}/{total}")
-    print('='*60)
+    def fail(*args, **kwargs):
+        raise RuntimeError("proxy refresh failed")
     
-    if passed == total:
-        print("\n✅ All comprehensive bug fixes are working correctly!")
-        print("\nFixed Issues:")
-        print("  1. ✅ Resource leak - temporary directory cleanup")
-        print("  2. ✅ Race condition in proxy manager")
-        print("  3. ✅ Thread safety in logger")
-        print("  4. ✅ Error handling in network monitor")
-        print("  5. ✅ Cleanup in automation engine")
-        print("  6. ✅ Passport expiry field mapping")
-        return True
-    else:
-        print(f"\n❌ {total - passed} test(s) failed. Please review the errors above.")
-        return False
-
-if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    monkeypatch.setattr(engine.proxy_manager, 'refresh_proxy_list', fail)
+    
+    assert engine.start_automation() == False, "Failed run should report failure"
+    assert not os.path.exists(temp_dir), "start_automation should remove the browser temp dir"
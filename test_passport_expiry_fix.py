@@ -4,238 +4,74 @@ Test for passport expiry field mapping bug fix
 Validates that passport_expiry_date field is correctly mapped
 """
 
-import sys
-import os
-from pathlib import Path
-import tempfile
-import csv
+import ast
+import io
 
-# Add src directory to Python path
-src_dir = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_dir))
+import pytest
 
-def test_field_detection():
-    """Test that browser automation correctly detects passport_expiry_date field"""
-    print("Testing field detection for passport_expiry_date...")
-    
-    try:
-        from components.browser_automation import BrowserAutomation
-        
-        browser = BrowserAutomation()
-        
-        # Test the _determine_field_purpose method
-        # Simulate field attributes that would match passport expiry
-        test_cases = [
-            {
-                'element_id': 'passport_expiry_date',
-                'name': 'passport_expiry_date',
-                'placeholder': 'Passport Expiry Date',
-                'label': 'Passport Expiry Date',
-                'input_type': 'date',
-                'expected': 'passport_expiry_date'
-            },
-            {
-                'element_id': 'passport_expiry',
-                'name': 'passport_expiry',
-                'placeholder': 'Expiry Date',
-                'label': 'Passport Expiry',
-                'input_type': 'date',
-                'expected': 'passport_expiry_date'
-            },
-            {
-                'element_id': 'expiry_date',
-                'name': 'expiry_date',
-                'placeholder': '',
-                'label': 'Expiry Date',
-                'input_type': 'date',
-                'expected': 'passport_expiry_date'
-            }
-        ]
-        
-        passed = 0
-        for i, test_case in enumerate(test_cases, 1):
-            result = browser._determine_field_purpose(
-                test_case['element_id'],
-                test_case['name'],
-                test_case['placeholder'],
-                test_case['label'],
-                test_case['input_type']
-            )
-            
-            if result == test_case['expected']:
-                print(f"  ✓ Test case {i}: '{test_case['name']}' correctly detected as '{result}'")
-                passed += 1
-            else:
-                print(f"  ✗ Test case {i}: '{test_case['name']}' detected as '{result}', expected '{test_case['expected']}'")
-        
-        print(f"\nField detection: {passed}/{len(test_cases)} tests passed")
-        return passed == len(test_cases)
-        
-    except Exception as e:
-        print(f"✗ Field detection test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+# Components import Selenium; skip cleanly where it is not installed
+pytest.importorskip("selenium")
 
-def test_form_handler_mapping():
-    """Test that form handler correctly maps passport_expiry_date from CSV data"""
-    print("\nTesting form handler field mapping...")
-    
-    try:
-        from components.form_handler import FormHandler
-        from components.browser_automation import BrowserAutomation
-        
-        # Create a temporary CSV file with test data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
-            csv_file = f.name
-            writer = csv.writer(f)
-            
-            # Write header
-            writer.writerow([
-                'Appointment_Location', 'Country', 'City', 'Country_Traveling_To',
-                'First_Name', 'Last_Name', 'Date_Of_Birth', 'Nationality',
-                'Gender', 'Marital_Status', 'Passport_Number', 'Confirm_Passport_Number',
-                'Passport_Issue_Date', 'Passport_Issue_Place', 'Passport_Expiry_Date',
-                'Visa_Type', 'Email_Address', 'Phone', 'National_ID', 'Position_Applied_For'
-            ])
-            
-            # Write test data
-            writer.writerow([
-                'Test Location', 'USA', 'New York', 'Saudi Arabia',
-                'John', 'Doe', '1990-01-01', 'American',
-                'Male', 'Single', 'P123456', 'P123456',
-                '2020-01-01', 'New York', '2030-12-31',
-                'Work', 'john.doe@example.com', '+1234567890', 'N123456', 'Engineer'
-            ])
-        
-        try:
-            # Create form handler
-            browser = BrowserAutomation()
-            form_handler = FormHandler(browser)
-            
-            # Load CSV data
-            success = form_handler.load_candidate_data(csv_file)
-            
-            if not success:
-                print("  ✗ Failed to load CSV data")
-                return False
-            
-            # Check that passport_expiry_date is correctly loaded
-            passport_expiry = form_handler.candidate_data.get('passport_expiry_date')
-            
-            if passport_expiry == '2030-12-31':
-                print(f"  ✓ Passport expiry date correctly loaded: {passport_expiry}")
-            else:
-                print(f"  ✗ Passport expiry date incorrect: {passport_expiry} (expected '2030-12-31')")
-                return False
-            
-            # Verify the field mapping in fill_candidate_info would use correct key
-            # We can't actually fill fields without a browser, but we can check the mapping
-            print("  ✓ Field mapping includes 'passport_expiry_date' key")
-            
-            return True
-            
-        finally:
-            # Clean up temp file
-            os.unlink(csv_file)
-        
-    except Exception as e:
-        print(f"✗ Form handler mapping test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+from components.browser_automation import BrowserAutomation
+from components.form_handler import FormHandler
 
-def test_backward_compatibility():
-    """Test that the fix doesn't break existing functionality"""
-    print("\nTesting backward compatibility...")
-    
-    try:
-        from components.browser_automation import BrowserAutomation
-        
-        browser = BrowserAutomation()
-        
-        # Test other date fields still work correctly
-        test_cases = [
-            {
-                'element_id': 'date_of_birth',
-                'name': 'dob',
-                'placeholder': 'Date of Birth',
-                'label': 'Birth Date',
-                'input_type': 'date',
-                'expected': 'date_of_birth'
-            },
-            {
-                'element_id': 'passport_issue_date',
-                'name': 'issue_date',
-                'placeholder': 'Issue Date',
-                'label': 'Passport Issue Date',
-                'input_type': 'date',
-                'expected': 'passport_issue_date'
-            }
-        ]
-        
-        passed = 0
-        for test_case in test_cases:
-            result = browser._determine_field_purpose(
-                test_case['element_id'],
-                test_case['name'],
-                test_case['placeholder'],
-                test_case['label'],
-                test_case['input_type']
-            )
-            
-            if result == test_case['expected']:
-                print(f"  ✓ '{test_case['expected']}' still works correctly")
-                passed += 1
-            else:
-                print(f"  ✗ '{test_case['expected']}' broken: detected as '{result}'")
-        
-        print(f"\nBackward compatibility: {passed}/{len(test_cases)} tests passed")
-        return passed == len(test_cases)
-        
-    except Exception as e:
-        print(f"✗ Backward compatibility test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+CASES = [
+    # Passport expiry date detection
+    ('passport_expiry_date', 'passport_expiry_date', 'Passport Expiry Date',
+     'Passport Expiry Date', 'date', 'passport_expiry_date'),
+    ('passport_expiry', 'passport_expiry', 'Expiry Date', 'Passport Expiry', 'date', 'passport_expiry_date'),
+    ('expiry_date', 'expiry_date', '', 'Expiry Date', 'date', 'passport_expiry_date'),
+    # Other date fields still work correctly
+    ('date_of_birth', 'dob', 'Date of Birth', 'Birth Date', 'date', 'date_of_birth'),
+    ('passport_issue_date', 'issue_date', 'Issue Date', 'Passport Issue Date', 'date', 'passport_issue_date'),
+    # Passport date/place purposes take priority over the generic passport number
+    ('passport_issue_place', 'issue_place', 'Place of Issue', 'Passport Issue Place', 'text', 'passport_issue_place'),
+    ('passport_number', 'passport_number', 'Passport Number', 'Passport Number', 'text', 'passport_number'),
+    ('txtPassportNo', 'passport_no', 'Passport Number', 'Passport No. (as issued)', 'text', 'passport_number'),
+    # ID numbers on passport/visa fields keep their document purpose
+    ('passport_id', 'passport_id_number', 'Passport ID Number', 'Passport ID Number', 'text', 'passport_number'),
+    ('visa_id', 'visa_id_number', 'Visa ID Number', 'Visa ID Number', 'text', 'visa_type'),
+    # Nationality and national ID are not shadowed by the country 'nation' pattern
+    ('national_id', 'national_id', 'National ID', 'National ID Number', 'text', 'national_id'),
+    ('civil_id', 'civil_id', '', 'Civil ID', 'text', 'national_id'),
+    ('nationality', 'nationality', 'Nationality', 'Nationality', 'select', 'nationality'),
+    ('country', 'country', 'Country', 'Country of Citizenship', 'select', 'country'),
+]
 
-def main():
-    """Run all tests for the passport expiry fix"""
-    print("=== Passport Expiry Field Mapping Fix - Test Suite ===\n")
-    
-    # Ensure directories exist
-    os.makedirs("data", exist_ok=True)
-    os.makedirs("logs", exist_ok=True)
-    
-    tests = [
-        test_field_detection,
-        test_form_handler_mapping,
-        test_backward_compatibility
-    ]
-    
-    passed = 0
-    total = len(tests)
+@pytest.mark.parametrize("element_id,name,placeholder,label,input_type,expected", CASES)
+def test_determine_field_purpose(element_id, name, placeholder, label, input_type, expected):
+    """Test that browser automation maps field attributes to the expected purpose"""
+    assert BrowserAutomation._determine_field_purpose(element_id, name, placeholder, label, input_type) == expected
+
+def test_fill_candidate_info_uses_expiry_key(ast_of):
+    """Test that form handler fills the passport expiry field under its detected key"""
+    keys = {key.value for node in ast.walk(ast_of(FormHandler.fill_candidate_info))
+            if isinstance(node, ast.Dict) for key in node.keys if isinstance(key, ast.Constant)}
+    assert 'passport_expiry_date' in keys, "Form handler should use 'passport_expiry_date' key"
+    assert 'passport_expiry' not in keys, "Form handler should not use old 'passport_expiry' key"
+
+def test_form_handler_mapping(browser_automation):
+    """Test that form handler correctly maps passport_expiry_date from CSV data"""
+    csv_text = (
+        "Appointment_Location,Country,City,Country_Traveling_To,"
+        "First_Name,Last_Name,Date_Of_Birth,Nationality,"
+        "Gender,Marital_Status,Passport_Number,Confirm_Passport_Number,"
+        "Passport_Issue_Date,Passport_Issue_Place,Passport_Expiry_Date,"
+        "Visa_Type,Email_Address,Phone,National_ID,Position_Applied_For\n"
+        "Test Location,USA,New York,Saudi Arabia,"
+        "John,Doe,1990-01-01,American,"
+        "Male,Single,P123456,P123456,"
+        "2020-01-01,New York,2030-12-31,"
+        "Work,john.doe@example.com,+1234567890,N123456,Engineer\n"
+    )
     
-    for test in tests:
-        try:
-            if test():
-                passed += 1
-        except Exception as e:
-            print(f"✗ Test {test.__name__} crashed: {e}")
-            import traceback
-            traceback.print_exc()
+    # Create form handler
+    form_handler = FormHandler(browser_automation)
     
-    print(f"\n=== Test Results ===")
-    print(f"Passed: {passed}/{total}")
-    print(f"Failed: {total - passed}/{total}")
+    # Load CSV data straight from memory, no temp file needed
+    assert form_handler.load_candidate_data(io.StringIO(csv_text)), "Failed to load CSV data"
     
-    if passed == total:
-        print("\n✅ All tests passed! The passport expiry field mapping fix is working correctly.")
-        return True
-    else:
-        print("\n❌ Some tests failed. Please review the errors above.")
-        return False
-
-if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    # Check that passport_expiry_date is correctly loaded
+    passport_expiry = form_handler.candidate_data.get('passport_expiry_date')
+    assert passport_expiry == '2030-12-31', \
+        f"Passport expiry date incorrect: {passport_expiry} (expected '2030-12-31')"